@@ -1,4 +1,7 @@
-create table snippets (
+create table if not exists snippets (
 keyword text primary key,
 message text not null default ''
 );
+
+create extension if not exists pg_trgm;
+create index if not exists snippets_msg_trgm on snippets using gin (message gin_trgm_ops);
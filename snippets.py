@@ -1,59 +1,187 @@
 import logging
 import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 import psycopg2
+import psycopg2.pool
+from psycopg2.extras import execute_values
 
-#Set the log output file, and the log level
-logging.basicConfig(filename="snippets.log", level=logging.DEBUG)
-logging.debug("Connecting to postgres")
-connection = psycopg2.connect(database="snippets")
-logging.debug("Database connection established")
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """
+    Returns the shared connection pool, creating it on first use.
+    A single CLI invocation only ever needs one connection, so the pool
+    starts with one and grows on demand for threaded callers.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                logger.debug("Connecting to postgres")
+                _pool = psycopg2.pool.ThreadedConnectionPool(minconn=1, maxconn=10, database="snippets")
+                logger.debug("Database connection pool established")
+    return _pool
+
+@contextmanager
+def borrow():
+    """
+    Borrows a connection from the pool for the duration of a transaction.
+    The transaction is committed on success, rolled back on error, and the
+    connection is returned to the pool either way.
+    """
+    pool = get_pool()
+    connection = pool.getconn()
+    try:
+        with connection:
+            yield connection
+    finally:
+        pool.putconn(connection)
+
+#Server-side prepared statements, keyed by name: (argument types, query)
+STATEMENTS = {
+    "snip_upsert": ("(text, text)", "insert into snippets values ($1, $2) "
+                                    "on conflict (keyword) do update set message=excluded.message"),
+    "snip_update": ("(text, text)", "update snippets set message=$1 where keyword=$2"),
+    "snip_get": ("(text)", "select message from snippets where keyword=$1"),
+    "snip_delete": ("(text)", "delete from snippets where keyword=$1"),
+}
+
+#Names of the statements already prepared on each pooled connection
+_prepared = weakref.WeakKeyDictionary()
+
+def execute_prepared(cursor, name, params=()):
+    """
+    Executes the named statement from STATEMENTS, preparing it on the
+    cursor's connection the first time it is used there so the server
+    only parses and plans it once per session.
+    """
+    prepared = _prepared.setdefault(cursor.connection, set())
+    if name not in prepared:
+        types, query = STATEMENTS[name]
+        cursor.execute("prepare {}{} as {}".format(name, types, query))
+        prepared.add(name)
+    if params:
+        cursor.execute("execute {}({})".format(name, ", ".join(["%s"] * len(params))), params)
+    else:
+        cursor.execute("execute {}".format(name))
 
 def put(name, snippet):
     """
-    Stores a snippet with an associated name.
+    Stores a snippet with an associated name, replacing any existing
+    snippet stored under that name.
     Returns the name and the snippet.
     """
-    logging.info("Storing snippet {!r}: {!r}".format(name, snippet))
-    with connection, connection.cursor() as cursor:
-        try:
-            cursor.execute("insert into snippets values (%s, %s)", (name, snippet))
-            logging.debug("Snippet stored successfully")
-        except psycopg2.IntegrityError as e:
-            connection.rollback()
-            cursor.execute("update snippets set message=%s where keyword=%s", (snippet, name))
-            logging.debug("Cannot insert new snippet with keyword duplicate - successfully updated message")
+    logger.info("Storing snippet %r: %r", name, snippet)
+    with borrow() as connection, connection.cursor() as cursor:
+        execute_prepared(cursor, "snip_upsert", (name, snippet))
+    _clear_caches()
+    logger.debug("Snippet stored successfully")
     return name, snippet
 
+def put_many(pairs, page_size=1000, synchronous_commit=True):
+    """
+    Stores many (name, snippet) pairs in a single transaction, sending
+    them to the server `page_size` rows per statement.
+    A name given more than once keeps its last snippet.
+    With synchronous_commit=False the commit does not wait for the WAL
+    flush: a server crash right after can lose the batch, but cannot
+    leave it half-applied.
+    Returns the number of snippets stored.
+    """
+    snippets = dict(pairs)
+    logger.info("Storing %d snippets", len(snippets))
+    with borrow() as connection, connection.cursor() as cursor:
+        if not synchronous_commit:
+            cursor.execute("set local synchronous_commit = off")
+        execute_values(cursor, "insert into snippets values %s "
+                       "on conflict (keyword) do update set message=excluded.message",
+                       list(snippets.items()), page_size=page_size)
+    _clear_caches()
+    logger.debug("Snippets stored successfully")
+    return len(snippets)
+
+#Seconds a cached result may be served before it is fetched again. This
+#bounds how long writes made by other processes can go unseen.
+CACHE_TTL = 60
+
+#Bumped after every local write; cached results are keyed on it
+_cache_generation = 0
+_cache_lock = threading.Lock()
+
+def _cache_key():
+    """
+    Returns the (generation, TTL bucket) pair cached results are keyed on.
+    An entry stops matching once a local write bumps the generation or the
+    TTL bucket rolls over, even if it was stored after the write.
+    """
+    return _cache_generation, int(time.monotonic() // CACHE_TTL)
+
 def get(name):
     """
     Retrieve the snippet with the given name.
     If there is no such snippet, return '404 Snippet Not Found'.
     Returns the snippet.
     """
-    logging.info("Getting snippet {!r}".format(name))
-    with connection, connection.cursor() as cursor:
-        cursor.execute("select message from snippets where keyword=%s", (name,))
+    logger.info("Getting snippet %r", name)
+    return _get_cached(name, *_cache_key())
+
+@lru_cache(maxsize=1024)
+def _get_cached(name, generation, bucket):
+    """
+    Looks up a snippet in the database. generation and bucket only key the
+    cache; see _cache_key().
+    """
+    with borrow() as connection, connection.cursor() as cursor:
+        execute_prepared(cursor, "snip_get", (name,))
         row = cursor.fetchone()
     if not row:
         return "404 Snippet Not Found"
-    logging.debug("Snippet retrieved successfully.")
+    logger.debug("Snippet retrieved successfully.")
     return row[0]
 
+def get_many(names):
+    """
+    Retrieve the snippets with the given names in a single query.
+    Returns a dict mapping each name that was found to its snippet.
+    """
+    names = list(names)
+    logger.info("Getting %d snippets", len(names))
+    with borrow() as connection, connection.cursor() as cursor:
+        cursor.execute("select keyword, message from snippets where keyword = any(%s)", (names,))
+        snippets = dict(cursor.fetchall())
+    logger.debug("Snippets retrieved successfully.")
+    return snippets
+
 def post(name, snippet):
     """
-    Retrieve snippet with the given name.
+    Replace the snippet with the given name by the one provided, in a
+    single update statement.
     If there is no such snippet, return '404 Snippet Not Found'.
-    Modify the snippet by replacing the current snippet with the one provided.
     Returns the name and the snippet.
     """
-    logging.info("Updating snippet {!r}: {!r}".format(name, snippet))
-    with connection, connection.cursor() as cursor:
-        cursor.execute("select message from snippets where keyword=%s", (name,))
-        if cursor.fetchone() is not None:
-            cursor.execute("update snippets set message=%s where keyword=%s", (snippet, name))
-        else:
+    logger.info("Updating snippet %r: %r", name, snippet)
+    with borrow() as connection, connection.cursor() as cursor:
+        execute_prepared(cursor, "snip_update", (snippet, name))
+        if cursor.rowcount == 0:
             return name, "404 Snippet Not Found"
-    logging.debug("Snippet updated successfully")
+    _clear_caches()
+    logger.debug("Snippet updated successfully")
     return name, snippet
 
 def delete(name):
@@ -62,116 +190,435 @@ def delete(name):
     If there is no such snippet, return '404 Snippet Not Found'.
     Returns the name of the deleted snippet.
     """
-    logging.info("Deleting snippet {!r}".format(name,))
-    with connection, connection.cursor() as cursor:
-        cursor.execute("select message from snippets where keyword=%s", (name,))
-        if cursor.fetchone() is not None:
-            cursor.execute("delete from snippets where keyword=%s", (name,))
-        else:
+    logger.info("Deleting snippet %r", name)
+    with borrow() as connection, connection.cursor() as cursor:
+        execute_prepared(cursor, "snip_delete", (name,))
+        if cursor.rowcount == 0:
             return "404 Snippet Not Found"
-    logging.debug("Snippet deleted successfully")
+    _clear_caches()
+    logger.debug("Snippet deleted successfully")
     return name
 
-def catalog():
+def catalog(batch_size=1000):
     """
-    Retrieves all keywords available.
-    If there are no keywords, returns '404 No Snippets Available'
+    Yields all available keywords in order.
+    Keywords are streamed from a server-side cursor `batch_size` at a time,
+    so the connection stays borrowed until the generator is exhausted or
+    closed.
     """
-    logging.info("Retrieving all snippets.")
-    with connection, connection.cursor() as cursor:
+    logger.info("Retrieving all snippets.")
+    with borrow() as connection, connection.cursor(name="snip_catalog") as cursor:
+        cursor.itersize = batch_size
         cursor.execute("select keyword from snippets order by keyword")
-        keywords = cursor.fetchall()
-    if not keywords:
-        return "404 No Snippets Found"
-    logging.debug("Retrieved all snippet keywords successfully")
-    return keywords
+        for row in cursor:
+            yield row[0]
+    logger.debug("Retrieved all snippet keywords successfully")
 
-def search(string):
+def like_pattern(string):
     """
-    Retrieves messages containing search string.
-    If there are no keywords, returns '404 No Matching Snippets Found'
+    Builds an ILIKE pattern matching messages that contain `string`
+    literally, escaping the LIKE wildcards and escape character.
     """
-    logging.info("Searching for snippet containing search string")
-    with connection, connection.cursor() as cursor:
-        cursor.execute("select * from snippets where message like '%{0}%'".format(string))
+    escaped = string.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return "%" + escaped + "%"
+
+#Most recently used search results, keyed on (string, limit, generation,
+#TTL bucket); see _cache_key()
+SEARCH_CACHE_SIZE = 256
+#Results with more rows than this are returned but not cached, so one broad
+#search can't hold a large part of the table in memory
+SEARCH_CACHE_MAX_ROWS = 100
+_search_cache = OrderedDict()
+
+def search(string, limit=None):
+    """
+    Retrieves messages containing search string, ignoring case as far as
+    the database's ILIKE folds it.
+    At most `limit` rows are returned; no limit if None.
+    Returns a tuple of (keyword, message) rows, or None if nothing matches.
+    """
+    logger.info("Searching for snippet containing search string")
+    #Keyed on the exact string: how ILIKE folds case depends on the
+    #database's locale, so differently cased searches may match different rows
+    key = (string, limit) + _cache_key()
+    with _cache_lock:
+        if key in _search_cache:
+            _search_cache.move_to_end(key)
+            return _search_cache[key]
+    rows = _search_db(string, limit)
+    if rows is not None and len(rows) > SEARCH_CACHE_MAX_ROWS:
+        return rows
+    with _cache_lock:
+        _search_cache[key] = rows
+        if len(_search_cache) > SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+    return rows
+
+def _search_db(string, limit):
+    """
+    Runs a search against the database.
+    """
+    with borrow() as connection, connection.cursor() as cursor:
+        cursor.execute("select keyword, message from snippets where message ilike %s limit %s",
+                       (like_pattern(string), limit))
         rows = cursor.fetchall()
     if not rows:
-        return '404 No Matching Snippets Found Containing', string
-    logging.debug("Retrieved matching snippets successfully")
+        return None
+    logger.debug("Retrieved matching snippets successfully")
+    return tuple(rows)
+
+def _clear_caches():
+    """
+    Invalidates cached lookups and searches after a write has committed.
+    """
+    global _cache_generation
+    with _cache_lock:
+        _cache_generation += 1
+        _search_cache.clear()
+    _get_cached.cache_clear()
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+
+def init_schema():
+    """
+    Creates the snippets table and its indexes if they don't exist yet.
+    The primary key on keyword is what get/post/delete look rows up by
+    and what the put upsert resolves conflicts against.
+    """
+    logger.info("Initialising schema")
+    with open(SCHEMA_PATH) as schema:
+        sql = schema.read()
+    with borrow() as connection, connection.cursor() as cursor:
+        cursor.execute(sql)
+    logger.debug("Schema initialised successfully")
+
+def read_tsv(stream):
+    """
+    Yields (name, snippet) pairs from tab-separated lines, skipping blanks.
+    Raises ValueError naming the line number if a line has no tab.
+    """
+    for number, line in enumerate(stream, 1):
+        line = line.rstrip("\r\n")
+        if line:
+            if "\t" not in line:
+                raise ValueError("line {}: expected name<TAB>snippet, got {!r}".format(number, line))
+            name, snippet = line.split("\t", 1)
+            yield name, snippet
+
+COMMANDS = {
+    "init": init_schema,
+    "put": put,
+    "bulk": put_many,
+    "get": get,
+    "post": post,
+    "delete": delete,
+    "catalog": catalog,
+    "search": search,
+}
+
+_async_pool = None
+
+async def _get_async_pool():
+    """
+    Returns the shared asyncpg pool, creating it on first use.
+    """
+    global _async_pool
+    if asyncpg is None:
+        raise RuntimeError("asyncpg is required for the async commands")
+    if _async_pool is None:
+        logger.debug("Connecting to postgres (asyncpg)")
+        _async_pool = await asyncpg.create_pool(database="snippets", min_size=2, max_size=20)
+        logger.debug("Async database connection pool established")
+    return _async_pool
+
+async def aput(name, snippet):
+    """
+    Async version of put().
+    """
+    logger.info("Storing snippet %r: %r", name, snippet)
+    pool = await _get_async_pool()
+    async with pool.acquire() as connection:
+        await connection.execute("insert into snippets values ($1, $2) "
+                                 "on conflict (keyword) do update set message=excluded.message", name, snippet)
+    _clear_caches()
+    logger.debug("Snippet stored successfully")
+    return name, snippet
+
+async def aput_many(pairs, synchronous_commit=True):
+    """
+    Async version of put_many().
+    """
+    snippets = dict(pairs)
+    logger.info("Storing %d snippets", len(snippets))
+    pool = await _get_async_pool()
+    async with pool.acquire() as connection, connection.transaction():
+        if not synchronous_commit:
+            await connection.execute("set local synchronous_commit = off")
+        await connection.executemany("insert into snippets values ($1, $2) "
+                                     "on conflict (keyword) do update set message=excluded.message",
+                                     list(snippets.items()))
+    _clear_caches()
+    logger.debug("Snippets stored successfully")
+    return len(snippets)
+
+async def aget(name):
+    """
+    Async version of get().
+    """
+    logger.info("Getting snippet %r", name)
+    pool = await _get_async_pool()
+    async with pool.acquire() as connection:
+        message = await connection.fetchval("select message from snippets where keyword=$1", name)
+    if message is None:
+        return "404 Snippet Not Found"
+    logger.debug("Snippet retrieved successfully.")
+    return message
+
+async def aget_many(names):
+    """
+    Async version of get_many().
+    """
+    names = list(names)
+    logger.info("Getting %d snippets", len(names))
+    pool = await _get_async_pool()
+    async with pool.acquire() as connection:
+        rows = await connection.fetch("select keyword, message from snippets where keyword = any($1::text[])", names)
+    logger.debug("Snippets retrieved successfully.")
+    return {row[0]: row[1] for row in rows}
+
+async def apost(name, snippet):
+    """
+    Async version of post().
+    """
+    logger.info("Updating snippet %r: %r", name, snippet)
+    pool = await _get_async_pool()
+    async with pool.acquire() as connection:
+        status = await connection.execute("update snippets set message=$1 where keyword=$2", snippet, name)
+    if status == "UPDATE 0":
+        return name, "404 Snippet Not Found"
+    _clear_caches()
+    logger.debug("Snippet updated successfully")
+    return name, snippet
+
+async def adelete(name):
+    """
+    Async version of delete().
+    """
+    logger.info("Deleting snippet %r", name)
+    pool = await _get_async_pool()
+    async with pool.acquire() as connection:
+        status = await connection.execute("delete from snippets where keyword=$1", name)
+    if status == "DELETE 0":
+        return "404 Snippet Not Found"
+    _clear_caches()
+    logger.debug("Snippet deleted successfully")
+    return name
+
+async def acatalog():
+    """
+    Async version of catalog(), returning a list of keywords.
+    """
+    logger.info("Retrieving all snippets.")
+    pool = await _get_async_pool()
+    async with pool.acquire() as connection:
+        rows = await connection.fetch("select keyword from snippets order by keyword")
+    logger.debug("Retrieved all snippet keywords successfully")
+    return [row[0] for row in rows]
+
+async def asearch(string, limit=None):
+    """
+    Async version of search().
+    """
+    logger.info("Searching for snippet containing search string")
+    pool = await _get_async_pool()
+    async with pool.acquire() as connection:
+        rows = await connection.fetch("select keyword, message from snippets where message ilike $1 limit $2",
+                                      like_pattern(string), limit)
+    if not rows:
+        return None
+    logger.debug("Retrieved matching snippets successfully")
     return rows
 
-def main():
-    """Main function"""
-    logging.info("Constructing parser")
+async def ainit_schema():
+    """
+    Async version of init_schema().
+    """
+    logger.info("Initialising schema")
+    with open(SCHEMA_PATH) as schema:
+        sql = schema.read()
+    pool = await _get_async_pool()
+    async with pool.acquire() as connection, connection.transaction():
+        await connection.execute(sql)
+    logger.debug("Schema initialised successfully")
+
+ASYNC_COMMANDS = {
+    "init": ainit_schema,
+    "put": aput,
+    "bulk": aput_many,
+    "get": aget,
+    "post": apost,
+    "delete": adelete,
+    "catalog": acatalog,
+    "search": asearch,
+}
+
+async def main_async(command, arguments):
+    """
+    Runs a single command through the asyncpg layer, then closes the pool.
+    """
+    global _async_pool
+    try:
+        return await ASYNC_COMMANDS[command](**arguments)
+    finally:
+        if _async_pool is not None:
+            await _async_pool.close()
+            _async_pool = None
+
+def _positive_int(value):
+    """Argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("not an integer: {!r}".format(value))
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1: {}".format(value))
+    return number
+
+def _build_parser():
+    """Builds the command line parser"""
     parser = argparse.ArgumentParser(description="Store and retrieve snippets of text.")
 
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Run the command through the asyncpg driver")
+
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    subparsers.required = True
+
+    #Subparser for the init command
+    init_parser = subparsers.add_parser("init", help="Create the snippets table and indexes if missing")
 
     #Subparser for the put command
-    logging.debug("Constructing put subparser.")
     put_parser = subparsers.add_parser("put", help="Store a snippet")
     put_parser.add_argument("name", help="Name of the snippet")
     put_parser.add_argument("snippet", help="Snippet text")
 
+    #Subparser for the bulk command
+    bulk_parser = subparsers.add_parser("bulk", help="Store many snippets read as name<TAB>snippet lines")
+    bulk_parser.add_argument("file", nargs="?", type=argparse.FileType("r"), default="-",
+                             help="File to read snippets from (default: standard input)")
+    bulk_parser.add_argument("--no-sync-commit", dest="synchronous_commit", action="store_false",
+                             help="Don't wait for the commit to reach disk. Faster, but a server crash "
+                                  "right after can lose the whole batch (it is never half-applied)")
+
     #Subparser for the get command
-    logging.debug("Constructing get subparser.")
     get_parser = subparsers.add_parser("get", help="Retrieve a stored snippet")
     get_parser.add_argument("name", help="Name of the snippet")
 
     #Subparser for the post command
-    logging.debug("Constructing post subparser.")
     post_parser = subparsers.add_parser("post", help="Modify a stored snippet")
     post_parser.add_argument("name", help="Name of snippet to update")
     post_parser.add_argument("snippet", help="Updated snippet text")
 
     #Subparser for delete command
-    logging.debug("Constructing delete subparser.")
     delete_parser = subparsers.add_parser("delete", help="Delete a stored snippet")
     delete_parser.add_argument("name", help="Name of snippet to delete")
 
     #Subparser for catalog command
-    logging.debug("Constructing catalog subparser.")
     catalog_parser = subparsers.add_parser("catalog", help="Retrieve all available keywords")
 
     #Subparser for search command
-    logging.debug("Constructing search command.")
     search_parser = subparsers.add_parser("search", help="Retrieve all keywords matching provided search string")
     search_parser.add_argument("string", help="String to find in existing messages")
+    search_parser.add_argument("--limit", type=_positive_int, help="Maximum number of snippets to return")
+
+    return parser
+
+@lru_cache(maxsize=None)
+def _get_parser():
+    """Returns the command line parser, building it on first use"""
+    return _build_parser()
 
+def _do_init(result, arguments):
+    """Prints confirmation that the schema was initialised"""
+    print("Schema initialised")
+
+def _do_put(result, arguments):
+    """Prints the stored snippet and its name"""
+    name, snippet = result
+    print("Stored {!r} as {!r}".format(snippet, name))
+
+def _do_bulk(result, arguments):
+    """Prints how many snippets were stored"""
+    print("Stored {} snippets".format(result))
+
+def _do_get(result, arguments):
+    """Prints the retrieved snippet"""
+    print("Retrieved snippet: {!r}".format(result))
+
+def _do_post(result, arguments):
+    """Prints the updated snippet and its name"""
+    name, snippet = result
+    print("Updated {!r} to: {!r}".format(name, snippet))
+
+def _do_delete(result, arguments):
+    """Prints the name of the deleted snippet"""
+    print("Deleted snippet: {!r}".format(result))
+
+def _do_catalog(result, arguments):
+    """Prints each keyword, or a 404 if there are none"""
+    keywords = iter(result)
+    first = next(keywords, None)
+    if first is None:
+        print("404 No Snippets Found")
+    else:
+        sys.stdout.write("Keywords: \n" + first + "\n")
+        sys.stdout.writelines(keyword + "\n" for keyword in keywords)
+
+def _do_search(result, arguments):
+    """Prints each matching snippet, or a 404 naming the search string"""
+    if result is None:
+        print("404 No Matching Snippets Found Containing {!r}".format(arguments["string"]))
+    else:
+        sys.stdout.write("Matching snippets: \n")
+        sys.stdout.writelines("{!r}: {!r}\n".format(kw, msg) for kw, msg in result)
+
+#Prints the result of each command. Every printer takes (result, arguments)
+#so main() can call them all the same way; only search needs the arguments,
+#to name the search string in its 404.
+DISPATCH = {
+    "init": _do_init,
+    "put": _do_put,
+    "bulk": _do_bulk,
+    "get": _do_get,
+    "post": _do_post,
+    "delete": _do_delete,
+    "catalog": _do_catalog,
+    "search": _do_search,
+}
+
+def main():
+    """Main function"""
+    parser = _get_parser()
     arguments = parser.parse_args()
 
     #Convert parsed arguments from Namespace to dictionary
     arguments = vars(arguments)
     command = arguments.pop("command")
+    if command == "bulk":
+        #Read all input up front so a malformed line is reported before anything is stored
+        try:
+            arguments["pairs"] = list(read_tsv(arguments.pop("file")))
+        except ValueError as error:
+            parser.error(str(error))
+
+    if arguments.pop("use_async"):
+        result = asyncio.run(main_async(command, arguments))
+    else:
+        result = COMMANDS[command](**arguments)
 
-    if command == "put":
-        name, snippet = put(**arguments)
-        print("Stored {!r} as {!r}".format(snippet, name))
-    elif command == "get":
-        snippet = get(**arguments)
-        print("Retrieved snippet: {!r}".format(snippet))
-    elif command == "post":
-        name, snippet = post(**arguments)
-        print("Updated {!r} to: {!r}".format(name, snippet))
-    elif command == "delete":
-        name = delete(**arguments)
-        print("Deleted snippet: {!r}".format(name))
-    elif command == "catalog":
-        keywords = catalog()
-        if keywords == "404 No Snippets Found":
-            print("{}".format(keywords))
-        else:
-            print("Keywords: ")
-            for keyword in keywords:
-                print(keyword[0])
-    elif command == "search":
-        string = search(**arguments)
-        if "404 No Matching Snippets Found Containing" in string:
-            print("{!r}: {!r}".format(string[0], string[1]))
-        else:
-            print("Matching snippets: ")
-            for kw, msg in string:
-                print("{!r}: {!r}".format(kw, msg))
+    DISPATCH[command](result, arguments)
 
 if __name__ == "__main__":
+    #Set the log output file, and the log level
+    logging.basicConfig(filename="snippets.log", level=logging.DEBUG)
     main()